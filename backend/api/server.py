@@ -1,17 +1,17 @@
 """FastAPI server"""
 from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import List
-from asyncio import create_task, to_thread
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from pydantic import BaseModel
 
 from core.config import Config
 from core.database import DeviceDatabase
 from core.scheduler import BackupScheduler
-from core.plugin_manager import PluginManager
+from core.plugin_manager import get_plugin_manager
 from core.auth import AuthService, TokenData
-from classes.device import Device
 from classes.backup_request import BackupRequest
 
 from logging import getLogger
@@ -21,7 +21,7 @@ from classes.backup import Backup
 logger = getLogger(__name__)
 
 # Global instances
-plugin_manager = PluginManager()
+plugin_manager = get_plugin_manager()
 device_db = DeviceDatabase()
 security = HTTPBearer()
 
@@ -41,10 +41,35 @@ class LoginResponse(BaseModel):
 def create_app(config: Config, scheduler: BackupScheduler) -> FastAPI:
     """Create FastAPI application"""
     
+    def load_output_module():
+        """Load the first configured output module"""
+        if not config.output:
+            return None
+        
+        try:
+            dest = config.output[0]
+            return plugin_manager.load_output_module(dest['type'], dest['config'])
+        except Exception as e:
+            logger.error(f"Failed to load output module: {e}")
+            return None
+    
+    # Manual backup runs get their own thread so they never occupy the
+    # shared pool used for request handling
+    backup_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="backup")
+    backup_future = None
+    
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        # Load plugins once at startup instead of on every request
+        app.state.output_module = load_output_module()
+        yield
+        backup_executor.shutdown(wait=False)
+    
     app = FastAPI(
         title="EDNA API",
         description="nEtwork Device coNfiguration bAckup",
-        version="1.0.0"
+        version="1.0.0",
+        lifespan=lifespan
     )
     
     # Initialize auth service with database
@@ -68,6 +93,12 @@ def create_app(config: Config, scheduler: BackupScheduler) -> FastAPI:
             raise HTTPException(status_code=401, detail="Invalid or expired token")
         return token_data
     
+    # Get output module preloaded at startup
+    def get_output_module():
+        if app.state.output_module is None:
+            raise HTTPException(status_code=500, detail="No output configured")
+        return app.state.output_module
+    
     @app.post("/api/auth/login", response_model=LoginResponse)
     async def login(request: LoginRequest):
         """Login with username and password"""
@@ -122,54 +153,39 @@ def create_app(config: Config, scheduler: BackupScheduler) -> FastAPI:
     @app.post("/api/backup/run")
     async def trigger_backup(request: BackupRequest = None):
         """Trigger a backup run"""
+        nonlocal backup_future
         try:
+            # Don't queue another full run behind a pending or running one
+            if (backup_future and not backup_future.done()) or scheduler.backup_in_progress():
+                logger.info("Manual backup ignored, a backup is already in progress")
+                return {"status": "running", "message": "Backup already in progress"}
+            
             logger.info("Manual backup triggered via API")
-            create_task(to_thread(scheduler.run_backup))
+            backup_future = backup_executor.submit(scheduler.run_backup)
             return {"status": "success", "message": "Backup started in background"}
         except Exception as e:
             logger.error(f"Failed to start backup: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
-    @app.get("/api/devices")
-    async def get_devices() -> List[Device]:
+    @app.get("/api/devices", response_class=ORJSONResponse)
+    async def get_devices():
         """Get list of devices from database"""
         try:
-            # Get devices from database
+            # Plain dicts from the database, serialized directly by orjson
             devices = device_db.get_all_devices()
-            device_list = []
+            output_module = app.state.output_module
             
-            # Get output module to check for backups
-            output_module = None
-            if config.output:
+            # Ask the output module only about devices without a recorded backup
+            missing = [d for d in devices if not d['last_backup']]
+            if missing and output_module:
                 try:
-                    dest = config.output[0]
-                    output_module = plugin_manager.load_output_module(
-                        dest['type'],
-                        dest['config']
-                    )
+                    last_backups = output_module.get_last_backups_bulk([d['name'] for d in missing])
+                    for d in missing:
+                        d['last_backup'] = last_backups.get(d['name'])
                 except Exception as e:
-                    logger.error(f"Failed to load output module: {e}")
-            
-            for d in devices:
-                # Get last backup date from output module
-                last_backup = None
-                if output_module:
-                    try:
-                        backups = output_module.get_device_backups(d.name)
-                        if backups:
-                            # Get most recent backup
-                            last_backup = max(b['timestamp'] for b in backups)
-                    except:
-                        pass
-                
-                device_list.append(Device(
-                    name=d.name,
-                    host=d.host,
-                    device_type=d.device_type,
-                    last_backup=d.last_backup if d.last_backup else last_backup
-                ))
+                    logger.error(f"Failed to get last backups: {e}")
             
-            return device_list
+            return devices
         except Exception as e:
             logger.error(f"Error getting devices: {e}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -183,15 +199,7 @@ def create_app(config: Config, scheduler: BackupScheduler) -> FastAPI:
             if not device:
                 raise HTTPException(status_code=404, detail="Device not found")
             
-            # Get output module to check for backups
-            if not config.output:
-                raise HTTPException(status_code=500, detail="No output configured")
-            
-            output_module = plugin_manager.load_output_module(
-                config.output[0]['type'],
-                config.output[0]['config']
-            )
-            
+            output_module = get_output_module()
             content = output_module.get_device_last_backup_content(device_name)
             return {"content": content}
         except Exception as e:
@@ -202,15 +210,7 @@ def create_app(config: Config, scheduler: BackupScheduler) -> FastAPI:
     async def get_device_backups(device_name: str):
         """Get list of backups for a device"""
         try:
-            # Load first output module
-            if not config.output:
-                raise HTTPException(status_code=500, detail="No output configured")
-            
-            output_module = plugin_manager.load_output_module(
-                config.output[0]['type'],
-                config.output[0]['config']
-            )
-            
+            output_module = get_output_module()
             backups = output_module.get_device_backups(device_name)
             return backups
         except Exception as e:
@@ -221,21 +221,29 @@ def create_app(config: Config, scheduler: BackupScheduler) -> FastAPI:
     async def get_backup_content(device_name: str, id: str):
         """Get content of a specific backup"""
         try:
-            # Load first output module
-            if not config.output:
-                raise HTTPException(status_code=500, detail="No output configured")
-            
-            output_module = plugin_manager.load_output_module(
-                config.output[0]['type'],
-                config.output[0]['config']
-            )
-            
+            output_module = get_output_module()
             content = output_module.get_backup_content(device_name, Backup(id=id))
             return {"content": content}
         except Exception as e:
             logger.error(f"Error getting backup content: {e}")
             raise HTTPException(status_code=404, detail="Backup not found")
     
+    @app.get("/api/devices/{device_name}/backups/{id}/raw")
+    async def download_backup(device_name: str, id: str):
+        """Stream a specific backup as plain text"""
+        try:
+            output_module = get_output_module()
+            chunks = output_module.stream_backup_content(device_name, Backup(id=id))
+        except Exception as e:
+            logger.error(f"Error streaming backup content: {e}")
+            raise HTTPException(status_code=404, detail="Backup not found")
+        
+        return StreamingResponse(
+            chunks,
+            media_type="text/plain; charset=utf-8",
+            headers={"Content-Disposition": f'attachment; filename="{id}"'}
+        )
+    
     @app.post("/api/scheduler/start")
     async def start_scheduler():
         """Start the backup scheduler"""
@@ -1,11 +1,21 @@
 from abc import ABC, abstractmethod
+from typing import Sequence
 
 class DeviceModel(ABC):
     """Base class for device models"""
     
+    # Let netmiko shorten its prompt-detection delays; models for devices
+    # that cannot keep up set this to False
+    fast_cli: bool = True
+    
+    # Read command output straight up to the prompt on its own line instead
+    # of going through send_command; for very large configs that devices may
+    # pause before printing, where a quiet-period read would cut them short
+    read_until_prompt: bool = False
+    
     @abstractmethod
-    def get_commands(self) -> list:
-        """Return list of commands to execute"""
+    def get_commands(self) -> Sequence[str]:
+        """Return commands to execute, usually a class-level COMMANDS tuple"""
         pass
 
     @abstractmethod
@@ -1,4 +1,5 @@
-from typing import List
+from datetime import timezone
+from typing import Dict, Iterator, List
 from classes.base_module import BaseModule
 from classes.backup import Backup
 from abc import ABC, abstractmethod
@@ -29,6 +30,27 @@ class OutputModule(ABC, BaseModule):
         """
         pass
 
+    def get_last_backups_bulk(self, device_names: List[str]) -> Dict[str, str]:
+        """
+        Get the last backup time for several devices at once
+        
+        Modules that can answer this in a single pass over their storage
+        should override it; the default asks for each device in turn.
+        
+        Args:
+            device_names: Names of the devices
+        Returns:
+            Mapping of device name to the UTC time of its last backup,
+            formatted as %Y-%m-%dT%H:%M:%SZ
+        """
+        last_backups = {}
+        for device_name in device_names:
+            backups = self.get_device_backups(device_name)
+            if backups:
+                last_backup = max(b.creation_time for b in backups)
+                last_backups[device_name] = last_backup.astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        return last_backups
+
     @abstractmethod
     def get_device_last_backup_content(self, device_name: str) -> str:
         """
@@ -51,4 +73,20 @@ class OutputModule(ABC, BaseModule):
         Returns:
             Backup content as string
         """
-        pass
\ No newline at end of file
+        pass
+
+    def stream_backup_content(self, device_name: str, backup: Backup) -> Iterator[bytes]:
+        """
+        Get the content of a specific backup as UTF-8 encoded chunks
+        
+        Modules that can read their storage incrementally should override
+        it; the default returns the whole content as a single chunk. Missing
+        backups must raise here rather than while iterating.
+        
+        Args:
+            device_name: Name of the device
+            backup: Backup to read
+        Returns:
+            Iterator over the content in chunks
+        """
+        return iter((self.get_backup_content(device_name, backup).encode('utf-8'),))
@@ -5,4 +5,6 @@ class SchedulerConfig(BaseModel):
     """Scheduler configuration"""
     cron: Optional[str] = None
     enabled: bool = True
-    max_workers: int = 4  # parallel backup threads
\ No newline at end of file
+    max_workers: int = 4  # parallel backup threads
+    max_retries: int = 2  # retries per device on transient connection errors
+    retry_base_delay: float = 1.0  # seconds, doubled on each retry
\ No newline at end of file
@@ -1,17 +1,19 @@
 """Authentication module with JWT, local users, and LDAP support"""
 from datetime import datetime, timedelta
-from typing import Optional
+from functools import cached_property
+from hashlib import sha256
+from hmac import new as hmac_new
+from secrets import token_bytes
+from time import time
+from typing import NamedTuple, Optional
 from logging import getLogger
-from ldap import initialize, set_option, filter, OPT_NETWORK_TIMEOUT, OPT_REFERRALS, OPT_X_TLS_REQUIRE_CERT, OPT_X_TLS_NEVER, INVALID_CREDENTIALS, SCOPE_SUBTREE
 from jose import JWTError, jwt
-from passlib.context import CryptContext
-from pydantic import BaseModel
 
-logger = getLogger(__name__)
+from core.cache import TTLCache
 
-pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
+logger = getLogger(__name__)
 
-class TokenData(BaseModel):
+class TokenData(NamedTuple):
     username: str
     role: str = "user"
 
@@ -26,6 +28,13 @@ class AuthService:
         self.jwt_algorithm = config.get('jwt', {}).get('algorithm', 'HS256')
         self.jwt_expire_minutes = config.get('jwt', {}).get('expire_minutes', 1440)
         
+        # Verified tokens, keyed by SHA-256 of the raw token
+        self._token_cache = TTLCache(maxsize=10000, ttl=30)
+        
+        # Successful local logins, keyed by username and peppered password hash
+        self._password_cache = TTLCache(maxsize=2048, ttl=60)
+        self._pepper = token_bytes(16)
+        
         # LDAP settings
         ldap_cfg = config.get('ldap', {})
         self.ldap_enabled = ldap_cfg.get('enabled', False)
@@ -39,6 +48,7 @@ class AuthService:
         
         self.ldap_base_dn = ldap_cfg.get('base_dn')
         self.ldap_search_filter = ldap_cfg.get('search_filter', '(uid={username})')
+        self._ldap_filter_parts = self.ldap_search_filter.split('{username}')
         self.ldap_bind_dn = ldap_cfg.get('bind_dn')
         self.ldap_bind_password = ldap_cfg.get('bind_password')
         self.ldap_timeout = ldap_cfg.get('timeout', 5)
@@ -47,34 +57,58 @@ class AuthService:
         tls_cfg = ldap_cfg.get('tls', {})
         self.ldap_tls_verify = tls_cfg.get('verify_cert', False)
         self.ldap_tls_ca_path = tls_cfg.get('ca_cert_path')
+        
+        # Set global TLS option once, before any connection is created
+        if self.ldap_enabled and not self.ldap_tls_verify:
+            from ldap import set_option, OPT_X_TLS_REQUIRE_CERT, OPT_X_TLS_NEVER
+            set_option(OPT_X_TLS_REQUIRE_CERT, OPT_X_TLS_NEVER)
+        
+        # User DNs found by LDAP search, so frequent logins skip the search
+        self._ldap_dn_cache = TTLCache(maxsize=1024, ttl=300)
+        
+        # LDAP servers that recently failed to connect, skipped by later
+        # logins so they don't each wait out the network timeout
+        self._ldap_down = TTLCache(maxsize=64, ttl=30)
+    
+    @cached_property
+    def pwd_context(self):
+        """Password hashing context, built on first use"""
+        from passlib.context import CryptContext
+        return CryptContext(schemes=["sha256_crypt"], deprecated="auto")
     
     def verify_password(self, plain: str, hashed: str) -> bool:
         """Verify plain password against bcrypt hash"""
-        return pwd_context.verify(plain, hashed)
+        return self.pwd_context.verify(plain, hashed)
     
     def get_password_hash(self, password: str) -> str:
         """Hash password with bcrypt"""
-        return pwd_context.hash(password)
+        return self.pwd_context.hash(password)
     
     def authenticate_local(self, username: str, password: str) -> Optional[TokenData]:
         """Authenticate against local users in database"""
         if not self.db:
             return None
         
+        key = (username, hmac_new(self._pepper, password.encode(), 'sha256').digest())
+        token_data = self._password_cache.get(key)
+        if token_data is not None:
+            return token_data
+        
         user = self.db.get_user(username)
         if not user:
             return None
         
+        # Only successful verifications are cached, failures always pay the hash
         if self.verify_password(password, user.get('password_hash', '')):
-            return TokenData(username=username, role=user.get('role', 'user'))
+            token_data = TokenData(username=username, role=user.get('role', 'user'))
+            self._password_cache.set(key, token_data)
+            return token_data
         
         return None
     
     def _get_ldap_connection(self, server_uri: str):
         """Create and configure LDAP connection"""
-        # Set global TLS option before creating connection
-        if not self.ldap_tls_verify:
-            set_option(OPT_X_TLS_REQUIRE_CERT, OPT_X_TLS_NEVER)
+        from ldap import initialize, OPT_NETWORK_TIMEOUT, OPT_REFERRALS
         
         conn = initialize(server_uri)
         conn.set_option(OPT_NETWORK_TIMEOUT, self.ldap_timeout)
@@ -82,62 +116,81 @@ class AuthService:
         
         return conn
     
+    def _authenticate_ldap_server(self, server_uri: str, username: str, password: str) -> Optional[TokenData]:
+        """
+        Authenticate against a single LDAP server
+        
+        Returns None when the server rejects the login. Connection errors and
+        timeouts are raised so the caller can fail over to another server.
+        """
+        from ldap import filter, INVALID_CREDENTIALS, SCOPE_SUBTREE
+        
+        logger.debug(f"Trying LDAP server: {server_uri}")
+        
+        # Create connection
+        conn = self._get_ldap_connection(server_uri)
+        
+        user_dn = self._ldap_dn_cache.get(username)
+        if user_dn is None:
+            # Bind with service account if provided (for search)
+            if self.ldap_bind_dn and self.ldap_bind_password:
+                try:
+                    conn.simple_bind_s(self.ldap_bind_dn, self.ldap_bind_password)
+                except INVALID_CREDENTIALS:
+                    logger.warning(f"LDAP service account bind failed for {server_uri}")
+                    conn.unbind_s()
+                    return None
+            
+            # Search for user with custom filter
+            search_filter = filter.escape_filter_chars(username).join(self._ldap_filter_parts)
+            logger.debug(f"LDAP search filter: {search_filter}")
+            
+            results = conn.search_s(self.ldap_base_dn, SCOPE_SUBTREE, search_filter)
+            
+            if not results or results[0][0] is None:
+                logger.debug(f"LDAP user not found: {username} on {server_uri}")
+                conn.unbind_s()
+                return None
+            
+            user_dn = results[0][0]
+            logger.debug(f"Found user DN: {user_dn}")
+        
+        # Rebind the same connection as the user with provided password
+        try:
+            conn.simple_bind_s(user_dn, password)
+        except INVALID_CREDENTIALS:
+            logger.warning(f"LDAP invalid credentials for {username}")
+            # DN may be stale, search again next time
+            self._ldap_dn_cache.pop(username)
+            conn.unbind_s()
+            return None
+        
+        conn.unbind_s()
+        self._ldap_dn_cache.set(username, user_dn)
+        
+        logger.info(f"LDAP authentication successful for {username}")
+        return TokenData(username=username, role="user")
+    
     def authenticate_ldap(self, username: str, password: str) -> Optional[TokenData]:
         """Authenticate against LDAP servers with failover support"""
         if not self.ldap_enabled or not self.ldap_servers:
             return None
         
-        # Try each server in sequence (failover)
-        for server_uri in self.ldap_servers:
+        from ldap import SERVER_DOWN, TIMEOUT, CONNECT_ERROR
+        
+        # Servers are tried in order and the next one only when a server
+        # can't be reached. A rejected login is final, so a wrong password
+        # costs one failed bind rather than one per server.
+        servers = [s for s in self.ldap_servers if self._ldap_down.get(s) is None]
+        for server_uri in servers or self.ldap_servers:
             try:
-                logger.debug(f"Trying LDAP server: {server_uri}")
-                
-                # Create connection
-                conn = self._get_ldap_connection(server_uri)
-                
-                # Bind with service account if provided (for search)
-                if self.ldap_bind_dn and self.ldap_bind_password:
-                    try:
-                        conn.simple_bind_s(self.ldap_bind_dn, self.ldap_bind_password)
-                    except INVALID_CREDENTIALS:
-                        logger.warning(f"LDAP service account bind failed for {server_uri}")
-                        conn.unbind_s()
-                        continue
-                
-                # Search for user with custom filter
-                search_filter = self.ldap_search_filter.format(username=filter.escape_filter_chars(username))
-                logger.debug(f"LDAP search filter: {search_filter}")
-                
-                results = conn.search_s(self.ldap_base_dn, SCOPE_SUBTREE, search_filter)
-                
-                if not results or results[0][0] is None:
-                    logger.debug(f"LDAP user not found: {username} on {server_uri}")
-                    conn.unbind_s()
-                    continue
-                
-                user_dn = results[0][0]
-                logger.debug(f"Found user DN: {user_dn}")
-                
-                # Try to bind as the user with provided password
-                try:
-                    user_conn = self._get_ldap_connection(server_uri)
-                    user_conn.simple_bind_s(user_dn, password)
-                    user_conn.unbind_s()
-                    
-                    logger.info(f"LDAP authentication successful for {username}")
-                    return TokenData(username=username, role="user")
-                except INVALID_CREDENTIALS:
-                    logger.warning(f"LDAP invalid credentials for {username}")
-                    conn.unbind_s()
-                    continue
-                except Exception as e:
-                    logger.warning(f"LDAP user bind error for {username}: {e}")
-                    conn.unbind_s()
-                    continue
-            
-            except Exception as e:
+                return self._authenticate_ldap_server(server_uri, username, password)
+            except (SERVER_DOWN, TIMEOUT, CONNECT_ERROR) as e:
                 logger.warning(f"LDAP connection error for {server_uri}: {e}")
-                continue
+                self._ldap_down.set(server_uri, True)
+            except Exception as e:
+                logger.warning(f"LDAP error for {server_uri}: {e}")
+                return None
         
         return None
     
@@ -169,12 +222,23 @@ class AuthService:
     
     def verify_token(self, token: str) -> Optional[TokenData]:
         """Verify JWT token and return token data"""
+        key = sha256(token.encode()).digest()
+        token_data = self._token_cache.get(key)
+        if token_data is not None:
+            return token_data
+        
         try:
-            payload = jwt.decode(token, self.jwt_secret, algorithms=[self.jwt_algorithm])
-            username: str = payload.get("sub")
-            role: str = payload.get("role", "user")
-            if username is None:
-                return None
-            return TokenData(username=username, role=role)
+            payload = jwt.decode(
+                token,
+                self.jwt_secret,
+                algorithms=[self.jwt_algorithm],
+                options={"require_sub": True, "require_exp": True}
+            )
         except JWTError:
             return None
+        
+        token_data = TokenData(payload["sub"], payload.get("role", "user"))
+        
+        # Only cache successful verifications, never past token expiration
+        self._token_cache.set(key, token_data, ttl=payload["exp"] - time())
+        return token_data
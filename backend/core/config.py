@@ -1,20 +1,30 @@
 """Configuration management"""
 from os import getenv
-from yaml import safe_load, dump
-from re import sub
+from yaml import load, dump
+try:
+    # libyaml bindings are much faster when available
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+from re import compile as re_compile
 from pathlib import Path
 from typing import Dict, Any
 from classes.scheduler_config import SchedulerConfig
 from classes.logging_config import LoggingConfig
 
+# Pattern for ${VAR_NAME} or ${VAR_NAME:-default}
+_ENV_VAR_PATTERN = re_compile(r'\$\{([^}:]+)(?::(-)?([^}]*))?\}')
+
+
 def _expand_env_vars(value: Any) -> Any:
     """
     Recursively expand environment variables in configuration values.
     Supports ${VAR_NAME} and ${VAR_NAME:-default_value} syntax.
     """
     if isinstance(value, str):
-        # Pattern for ${VAR_NAME} or ${VAR_NAME:-default}
-        pattern = r'\$\{([^}:]+)(?::(-)?([^}]*))?\}'
+        # Most values contain no variables at all
+        if '${' not in value:
+            return value
         
         def replace_var(match):
             var_name = match.group(1)
@@ -29,7 +39,7 @@ def _expand_env_vars(value: Any) -> Any:
             else:
                 raise ValueError(f"Environment variable '{var_name}' not found and no default provided")
         
-        return sub(pattern, replace_var, value)
+        return _ENV_VAR_PATTERN.sub(replace_var, value)
     
     elif isinstance(value, dict):
         return {k: _expand_env_vars(v) for k, v in value.items()}
@@ -61,7 +71,7 @@ class Config:
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
         
         with open(config_path, 'r') as f:
-            data = safe_load(f)
+            data = load(f, Loader=SafeLoader)
         
         # Expand environment variables
         data = _expand_env_vars(data)
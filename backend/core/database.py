@@ -1,10 +1,56 @@
 """SQLite database for device cache"""
-from sqlite3 import connect, Row
+from sqlite3 import connect
 from pathlib import Path
+from threading import local
+from time import monotonic
 from typing import List, Optional
 
 from classes.device import Device
 
+# How long a device list is reused while the database is unchanged
+_DEVICES_CACHE_TTL = 5
+
+# Statements used on every request are kept as constants so sqlite3's
+# statement cache always sees the exact same SQL text
+_SQL_UPSERT_DEVICE = """
+    INSERT INTO devices (name, host, device_type, last_backup)
+    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+    ON CONFLICT(name) DO UPDATE SET
+        host = excluded.host,
+        device_type = excluded.device_type,
+        last_backup = CURRENT_TIMESTAMP
+"""
+
+_SQL_GET_ALL_DEVICES = """
+    SELECT name, host, device_type, last_backup
+    FROM devices
+    ORDER BY name
+"""
+
+_SQL_GET_DEVICE = """
+    SELECT name, host, device_type, last_backup
+    FROM devices
+    WHERE name = ?
+"""
+
+_SQL_REMOVE_STALE_DEVICES = """
+    DELETE FROM devices
+    WHERE last_backup < datetime('now', ?)
+"""
+
+_SQL_GET_USER = """
+    SELECT username, password_hash, role
+    FROM users
+    WHERE username = ?
+"""
+
+_SQL_CREATE_USER = """
+    INSERT INTO users (username, password_hash, role)
+    VALUES (?, ?, ?)
+"""
+
+_SQL_USER_EXISTS = "SELECT 1 FROM users WHERE username = ?"
+
 
 class DeviceDatabase:
     """Manages device cache in SQLite"""
@@ -12,11 +58,24 @@ class DeviceDatabase:
     def __init__(self, db_path: str = "data/edna.db"):
         self.db_path = Path(db_path)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = local()
         self._init_db()
     
+    def _conn(self):
+        """Get this thread's database connection, opening it on first use"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = connect(self.db_path)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            self._local.conn = conn
+        return conn
+    
     def _init_db(self):
         """Initialize database schema"""
-        with connect(self.db_path) as conn:
+        conn = self._conn()
+        with conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS devices (
                     name TEXT PRIMARY KEY,
@@ -43,111 +102,103 @@ class DeviceDatabase:
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
-            
-            conn.commit()
     
     def upsert_devices(self, devices: List[Device]):
         """Insert or update devices from input sources"""
-        with connect(self.db_path) as conn:
-            for device in devices:
-                conn.execute("""
-                    INSERT INTO devices (name, host, device_type, last_backup)
-                    VALUES (?, ?, ?, CURRENT_TIMESTAMP)
-                    ON CONFLICT(name) DO UPDATE SET
-                        host = excluded.host,
-                        device_type = excluded.device_type,
-                        last_backup = CURRENT_TIMESTAMP
-                """, (
-                    device.name,
-                    device.host,
-                    device.device_type
-                ))
-            
-            conn.commit()
+        rows = [(d.name, d.host, d.device_type) for d in devices]
+        
+        conn = self._conn()
+        with conn:
+            conn.executemany(_SQL_UPSERT_DEVICE, rows)
+        self._reset_caches()
     
-    def get_all_devices(self) -> List[Device]:
-        """Get all devices from database"""
-        with connect(self.db_path) as conn:
-            conn.row_factory = Row
-            cursor = conn.execute("""
-                SELECT name, host, device_type, last_backup
-                FROM devices
-                ORDER BY name
-            """)
-            
-            return [
-                Device(
-                    name=row['name'],
-                    host=row['host'],
-                    device_type=row['device_type'],
-                    last_backup=row['last_backup'].replace(' ', 'T') + 'Z' if row['last_backup'] else None
-                )
-                for row in cursor.fetchall()
-            ]
+    def _reset_caches(self):
+        """Drop this thread's cached query results after a write"""
+        self._local.devices_cache = None
+        self._local.device_cache = None
+    
+    def get_all_devices(self) -> List[dict]:
+        """
+        Get all devices from database as plain dicts, ready for serialization
+        
+        Rows are reused for a few seconds while the database is unchanged;
+        callers always get their own copies and are free to modify them.
+        """
+        conn = self._conn()
+        
+        # data_version changes whenever another connection commits a write;
+        # writes through this connection reset the cache themselves
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        cached = getattr(self._local, 'devices_cache', None)
+        if cached and cached[1] == data_version and monotonic() < cached[2]:
+            return [dict(device) for device in cached[0]]
+        
+        devices = [
+            {
+                'name': row[0],
+                'host': row[1],
+                'device_type': row[2],
+                'last_backup': row[3].replace(' ', 'T') + 'Z' if row[3] else None
+            }
+            for row in conn.execute(_SQL_GET_ALL_DEVICES)
+        ]
+        self._local.devices_cache = (devices, data_version, monotonic() + _DEVICES_CACHE_TTL)
+        return [dict(device) for device in devices]
     
     def get_device(self, name: str) -> Optional[Device]:
-        """Get single device by name"""
-        with connect(self.db_path) as conn:
-            conn.row_factory = Row
-            cursor = conn.execute("""
-                SELECT name, host, device_type, last_backup
-                FROM devices
-                WHERE name = ?
-            """, (name,))
-            
-            row = cursor.fetchone()
+        """Get single device by name, reusing recent rows like get_all_devices"""
+        conn = self._conn()
+        
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        cached = getattr(self._local, 'device_cache', None)
+        if not cached or cached[0] != data_version or monotonic() >= cached[1]:
+            cached = (data_version, monotonic() + _DEVICES_CACHE_TTL, {})
+            self._local.device_cache = cached
+        
+        row = cached[2].get(name)
+        if row is None:
+            row = conn.execute(_SQL_GET_DEVICE, (name,)).fetchone()
             if not row:
+                # Misses are not cached, names come straight from requests
                 return None
-            
-            return Device(
-                name=row['name'],
-                host=row['host'],
-                device_type=row['device_type'],
-                last_backup=row['last_backup'].replace(' ', 'T') + 'Z' if row['last_backup'] else None
-            )
+            cached[2][name] = row
+        
+        return Device.model_construct(
+            name=row[0],
+            host=row[1],
+            device_type=row[2],
+            last_backup=row[3].replace(' ', 'T') + 'Z' if row[3] else None
+        )
     
     def remove_stale_devices(self, hours: int = 24):
         """Remove devices not seen in X hours"""
-        with connect(self.db_path) as conn:
-            conn.execute("""
-                DELETE FROM devices
-                WHERE last_backup < datetime('now', '-{} hours')
-            """.format(hours))
-            
-            conn.commit()    
+        if not isinstance(hours, int):
+            raise TypeError(f"hours must be an int, got {type(hours).__name__}")
+        
+        conn = self._conn()
+        with conn:
+            conn.execute(_SQL_REMOVE_STALE_DEVICES, (f"-{hours} hours",))
+        self._reset_caches()
+    
     def get_user(self, username: str) -> Optional[dict]:
         """Get user by username"""
-        with connect(self.db_path) as conn:
-            conn.row_factory = Row
-            cursor = conn.execute("""
-                SELECT username, password_hash, role
-                FROM users
-                WHERE username = ?
-            """, (username,))
-            
-            row = cursor.fetchone()
-            if not row:
-                return None
-            
-            return dict(row)
+        row = self._conn().execute(_SQL_GET_USER, (username,)).fetchone()
+        
+        if not row:
+            return None
+        
+        return {'username': row[0], 'password_hash': row[1], 'role': row[2]}
     
     def create_user(self, username: str, password_hash: str, role: str = "user") -> bool:
         """Create a new user"""
         try:
-            with connect(self.db_path) as conn:
-                conn.execute("""
-                    INSERT INTO users (username, password_hash, role)
-                    VALUES (?, ?, ?)
-                """, (username, password_hash, role))
-                conn.commit()
+            conn = self._conn()
+            with conn:
+                conn.execute(_SQL_CREATE_USER, (username, password_hash, role))
             return True
         except Exception:
             return False
     
     def user_exists(self, username: str) -> bool:
         """Check if user exists"""
-        with connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT 1 FROM users WHERE username = ?
-            """, (username,))
-            return cursor.fetchone() is not None
\ No newline at end of file
+        return self._conn().execute(_SQL_USER_EXISTS, (username,)).fetchone() is not None
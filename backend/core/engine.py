@@ -1,28 +1,87 @@
 """Device backup engine"""
-from traceback import format_exc
 from typing import Optional
 from logging import getLogger
-from netmiko import ConnectHandler
-from netmiko.exceptions import NetMikoTimeoutException, NetMikoAuthenticationException
+from random import random
+from re import MULTILINE, escape
+from time import sleep
 
 from classes.device import Device
 
 logger = getLogger(__name__)
 
+_RETRY_JITTER = 0.5
+_RETRY_MAX_DELAY = 30
+
 class BackupEngine:
     """Core backup engine"""
     
+    def __init__(self, max_retries: int = 2, base_delay: float = 1.0):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+    
+    def _retry_delay(self, attempt: int) -> float:
+        """Exponential backoff with jitter for the given attempt number"""
+        delay = self.base_delay * 2 ** attempt * (1 + random() * _RETRY_JITTER)
+        return min(_RETRY_MAX_DELAY, delay)
+    
+    def _fetch_config(self, device: Device, model, connection_params: dict) -> str:
+        """Connect to the device and run the model commands"""
+        from netmiko import ConnectHandler
+        
+        logger.info(f"Connecting to {device.name} ({device.host})...")
+        
+        with ConnectHandler(**connection_params) as conn:
+            logger.info(f"Connected to {device.name}")
+            
+            # Get commands from model
+            commands = model.get_commands()
+            
+            # Detect the prompt once; otherwise send_command probes it again
+            # with an extra round-trip before every command
+            prompt = escape(conn.find_prompt().strip())
+            
+            config_output = []
+            for cmd in commands:
+                logger.debug(f"Executing: {cmd}")
+                if model.read_until_prompt:
+                    # Only a prompt alone at the end of a line ends the read, so
+                    # neither a pause in the output nor the echoed command can
+                    # end it early; a missing prompt raises ReadTimeout
+                    conn.write_channel(cmd + conn.RETURN)
+                    output = conn.read_until_pattern(
+                        pattern=rf"^{prompt}[ \t\r]*$", re_flags=MULTILINE, read_timeout=90
+                    )
+                    output = conn.strip_prompt(conn.strip_command(cmd, conn.normalize_linefeeds(output)))
+                else:
+                    output = conn.send_command(cmd, expect_string=prompt, read_timeout=90)
+                config_output.append(f"! Command: {cmd}\n{output}\n")
+            
+            # Post-process configuration
+            return model.process_config("\n".join(config_output))
+    
     def backup_device(self, device: Device, model) -> Optional[str]:
         """
         Backup a single device configuration
         
+        Transient connection errors are retried with exponential backoff,
+        authentication failures are not.
+        
         Args:
             device: Device object
             model: Device model with commands
-            
+        
         Returns:
             Configuration string or None on failure
         """
+        # netmiko pulls in paramiko and cryptography, so it is only
+        # imported once a backup actually runs
+        from netmiko.exceptions import NetMikoTimeoutException, NetMikoAuthenticationException
+        from paramiko.ssh_exception import SSHException
+        
+        # Transient connection failures worth another attempt. Authentication
+        # errors subclass SSHException too, so they must be handled first.
+        retryable = (NetMikoTimeoutException, TimeoutError, SSHException)
+        
         connection_params = {
             'device_type': device.device_type,
             'host': device.host,
@@ -31,38 +90,38 @@ class BackupEngine:
             'timeout': 60,  # Connection timeout
             'session_timeout': 60,  # Session timeout
             'read_timeout_override': 90,  # Command execution timeout
+            'conn_timeout': 10,  # TCP connect timeout
+            'auth_timeout': 15,  # Authentication response timeout
+            'banner_timeout': 10,  # SSH banner timeout
+            'fast_cli': model.fast_cli,
         }
         
-        try:
-            logger.info(f"Connecting to {device.name} ({device.host})...")
-            
-            with ConnectHandler(**connection_params) as conn:
-                logger.info(f"Connected to {device.name}")
-                
-                # Get commands from model
-                commands = model.get_commands()
-                
-                config_output = []
-                for cmd in commands:
-                    logger.debug(f"Executing: {cmd}")
-                    output = conn.send_command(cmd, read_timeout=90)
-                    config_output.append(f"! Command: {cmd}\n{output}\n")
-                
-                # Post-process configuration
-                config = model.process_config("\n".join(config_output))
-                
+        for attempt in range(self.max_retries + 1):
+            try:
+                config = self._fetch_config(device, model, connection_params)
                 logger.info(f"Successfully backed up {device.name}")
                 return config
+            
+            except NetMikoAuthenticationException as e:
+                logger.error(f"Authentication failed for {device.name}: {str(e)}")
+                logger.debug("Traceback:", exc_info=True)
+            
+            except retryable as e:
+                if attempt < self.max_retries:
+                    delay = self._retry_delay(attempt)
+                    logger.warning(
+                        f"Connection to {device.name} failed: {str(e)}, "
+                        f"retrying in {delay:.1f}s ({attempt + 1}/{self.max_retries})"
+                    )
+                    sleep(delay)
+                    continue
                 
-        except NetMikoTimeoutException as e:
-            logger.error(f"Timeout connecting to {device.name}: {str(e)}")
-            logger.debug(format_exc())
+                logger.error(f"Connection to {device.name} failed: {str(e)}")
+                logger.debug("Traceback:", exc_info=True)
             
-        except NetMikoAuthenticationException as e:
-            logger.error(f"Authentication failed for {device.name}: {str(e)}")
-            logger.debug(format_exc())
+            except Exception:
+                logger.exception(f"Error backing up {device.name}")
             
-        except Exception as e:
-            logger.error(f"Error backing up {device.name}:\n{format_exc()}")
+            break
         
         return None
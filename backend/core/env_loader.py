@@ -1,7 +1,15 @@
 """Load environment variables from .env file"""
 from pathlib import Path
+from re import compile as re_compile, MULTILINE
 import os
 
+# KEY=VALUE lines; surrounding quotes are dropped, anything else after the
+# "=" (including "#") is part of the value. Comment lines never match.
+_ENV_LINE_PATTERN = re_compile(
+    r'^[ \t]*([^#\s=][^=\n]*?)[ \t]*=[ \t]*(?:"(.*)"|\'(.*)\'|(.*?))[ \t\r]*$',
+    MULTILINE
+)
+
 
 def load_env_file(env_path: Path = None):
     """
@@ -16,24 +24,10 @@ def load_env_file(env_path: Path = None):
     if not env_path.exists():
         return
     
-    with open(env_path, 'r') as f:
-        for line in f:
-            line = line.strip()
-            # Skip empty lines and comments
-            if not line or line.startswith('#'):
-                continue
-            
-            # Parse KEY=VALUE
-            if '=' in line:
-                key, value = line.split('=', 1)
-                key = key.strip()
-                value = value.strip()
-                # Remove quotes if present
-                if value.startswith('"') and value.endswith('"'):
-                    value = value[1:-1]
-                elif value.startswith("'") and value.endswith("'"):
-                    value = value[1:-1]
-                
-                # Set environment variable if not already set
-                if key not in os.environ:
-                    os.environ[key] = value
+    new_vars = {}
+    for key, double_quoted, single_quoted, bare in _ENV_LINE_PATTERN.findall(env_path.read_text()):
+        # Variables already set in the environment win, then the first definition
+        if key not in os.environ and key not in new_vars:
+            new_vars[key] = double_quoted or single_quoted or bare
+    
+    os.environ.update(new_vars)
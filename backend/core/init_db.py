@@ -1,12 +1,18 @@
 """Initialize admin user if not exists"""
 import os
+from functools import cache
 from logging import getLogger
-from passlib.context import CryptContext
 
 logger = getLogger(__name__)
 
-# Use SHA256-crypt instead of bcrypt to avoid 72-byte limit
-pwd_context = CryptContext(schemes=["sha256_crypt"], deprecated="auto")
+
+@cache
+def _pwd_context():
+    """Password hashing context, only needed when the admin user is created"""
+    from passlib.context import CryptContext
+    
+    # Use SHA256-crypt instead of bcrypt to avoid 72-byte limit
+    return CryptContext(schemes=["sha256_crypt"], deprecated="auto")
 
 
 def init_admin_user(db):
@@ -15,7 +21,7 @@ def init_admin_user(db):
         logger.info("Admin user already exists")
         return
 
-    password_hash = pwd_context.hash('admin')
+    password_hash = _pwd_context().hash('admin')
     
     if db.create_user('admin', password_hash, 'admin'):
         logger.info("Admin user created successfully")
@@ -1,14 +1,31 @@
 """Plugin manager for dynamic module loading"""
+from functools import cache
 from importlib import import_module
 from logging import getLogger
 from pathlib import Path
-from typing import Dict, Any
+from typing import Dict, Any, Hashable, Optional, Type
 from classes.input_module import InputModule
 from classes.output_module import OutputModule
 from classes.device_model import DeviceModel
 
 logger = getLogger(__name__)
 
+
+def _freeze(value: Any) -> Hashable:
+    """Convert a module config into a hashable cache key"""
+    if isinstance(value, dict):
+        return tuple(sorted(((k, _freeze(v)) for k, v in value.items()), key=lambda item: str(item[0])))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+@cache
+def _class_name(module_type: str) -> str:
+    """Class name a plugin of the given type must define, e.g. cisco_ios -> CiscoIos"""
+    return ''.join(word.capitalize() for word in module_type.split('_'))
+
+
 class PluginManager:
     """Manages plugin loading"""
     
@@ -16,18 +33,28 @@ class PluginManager:
         self._input_cache = {}
         self._output_cache = {}
         self._model_cache = {}
+        self._model_index: Optional[Dict[str, Type[DeviceModel]]] = None
+    
+    def invalidate(self):
+        """Drop cached module instances so they are reloaded on next use"""
+        self._input_cache.clear()
+        self._output_cache.clear()
+        self._model_cache.clear()
+        self._model_index = None
     
     def load_input_module(self, module_type: str, config: Dict[str, Any]) -> InputModule:
         """Load an input module"""
-        if module_type in self._input_cache:
-            return self._input_cache[module_type]
+        # Same type with a different config is a different instance
+        key = (module_type, _freeze(config))
+        if key in self._input_cache:
+            return self._input_cache[key]
         
         try:
             module = import_module(f'modules.input.{module_type}')
-            class_name = ''.join(word.capitalize() for word in module_type.split('_'))
+            class_name = _class_name(module_type)
             module_class = getattr(module, class_name)
             instance = module_class(config)
-            self._input_cache[module_type] = instance
+            self._input_cache[key] = instance
             return instance
         except Exception as e:
             logger.error(f"Failed to load input module '{module_type}': {e}")
@@ -35,55 +62,67 @@ class PluginManager:
     
     def load_output_module(self, module_type: str, config: Dict[str, Any]) -> OutputModule:
         """Load an output module"""
-        if module_type in self._output_cache:
-            return self._output_cache[module_type]
+        # Same type with a different config is a different instance
+        key = (module_type, _freeze(config))
+        if key in self._output_cache:
+            return self._output_cache[key]
         
         try:
             module = import_module(f'modules.output.{module_type}')
-            class_name = ''.join(word.capitalize() for word in module_type.split('_'))
+            class_name = _class_name(module_type)
             module_class = getattr(module, class_name)
             instance = module_class(config)
-            self._output_cache[module_type] = instance
+            self._output_cache[key] = instance
             return instance
         except Exception as e:
             logger.error(f"Failed to load output module '{module_type}': {e}")
             raise
     
+    def _build_model_index(self) -> Dict[str, Type[DeviceModel]]:
+        """Import every model module once and index its model classes by name"""
+        index = {}
+        models_dir = Path(__file__).parent.parent / 'modules' / 'models'
+        
+        for model_file in sorted(models_dir.glob('*.py')):
+            if model_file.stem.startswith('_'):
+                continue
+            
+            try:
+                module = import_module(f'modules.models.{model_file.stem}')
+            except Exception as e:
+                logger.error(f"Failed to load device models from '{model_file.name}': {e}")
+                continue
+            
+            for name, obj in vars(module).items():
+                # Skip DeviceModel itself and classes imported from elsewhere
+                if isinstance(obj, type) and issubclass(obj, DeviceModel) and obj.__module__ == module.__name__:
+                    index.setdefault(name, obj)
+        
+        logger.debug(f"Indexed {len(index)} device models")
+        return index
+    
     def get_device_model(self, device_type: str) -> DeviceModel:
         """Get device model for a device type"""
         if device_type in self._model_cache:
             return self._model_cache[device_type]
         
-        class_name = ''.join(word.capitalize() for word in device_type.split('_'))
+        # Discover all models on first use instead of scanning per device type.
+        # Read the index once: invalidate() may reset it from another thread
+        index = self._model_index
+        if index is None:
+            index = self._model_index = self._build_model_index()
         
-        try:
-            # Try to load module with exact device_type name
-            module = import_module(f'modules.models.{device_type}')
-            model_class = getattr(module, class_name)
-            instance = model_class()
-            self._model_cache[device_type] = instance
-            return instance
-        except ModuleNotFoundError:
-            # Module doesn't exist, search for class in all available models
-            try:
-                models_dir = Path(__file__).parent.parent / 'modules' / 'models'
-                for model_file in models_dir.glob('*.py'):
-                    if model_file.stem.startswith('_'):
-                        continue
-                    try:
-                        module = import_module(f'modules.models.{model_file.stem}')
-                        if hasattr(module, class_name):
-                            model_class = getattr(module, class_name)
-                            instance = model_class()
-                            self._model_cache[device_type] = instance
-                            return instance
-                    except:
-                        continue
-            except Exception as e:
-                pass
-        except Exception as e:
-            pass
+        class_name = _class_name(device_type)
+        model_class = index.get(class_name)
+        if model_class is None:
+            raise Exception(f"No model found for device type '{device_type}' (class '{class_name}')")
         
-        # Model not found
-        raise Exception(f"No model found for device type '{device_type}' (class '{class_name}')")
+        instance = model_class()
+        self._model_cache[device_type] = instance
+        return instance
+
 
+@cache
+def get_plugin_manager() -> PluginManager:
+    """Process-wide plugin manager shared by the API and the scheduler"""
+    return PluginManager()
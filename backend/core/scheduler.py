@@ -1,16 +1,16 @@
 """Backup scheduler using APScheduler"""
 from logging import getLogger
 from datetime import datetime
+from threading import Lock
 from typing import Optional
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
-from apscheduler.triggers.cron import CronTrigger
 
 from core.config import Config
 from core.database import DeviceDatabase
 from core.engine import BackupEngine
-from core.plugin_manager import PluginManager
+from core.plugin_manager import get_plugin_manager
 
 logger = getLogger(__name__)
 
@@ -20,11 +20,16 @@ class BackupScheduler:
     
     def __init__(self, config: Config):
         self.config = config
-        self.engine = BackupEngine()
-        self.plugin_manager = PluginManager()
+        self.engine = BackupEngine(
+            max_retries=config.scheduler.max_retries,
+            base_delay=config.scheduler.retry_base_delay
+        )
+        self.plugin_manager = get_plugin_manager()
         self.database = DeviceDatabase()
         self.scheduler = BackgroundScheduler()
         self.last_run: Optional[datetime] = None
+        # Held for the whole of a backup run, so scheduled and manual runs never overlap
+        self._run_lock = Lock()
         
         # Setup schedule if enabled
         if config.scheduler.enabled:
@@ -45,7 +50,11 @@ class BackupScheduler:
                 trigger=trigger,
                 id='backup_devices',
                 name='Backup all devices',
-                replace_existing=True
+                replace_existing=True,
+                # Collapse ticks missed while a long run was still going into one
+                max_instances=1,
+                coalesce=True,
+                misfire_grace_time=300
             )
             
             # Start scheduler
@@ -64,27 +73,42 @@ class BackupScheduler:
             self.scheduler.shutdown(wait=False)
             logger.info("Scheduler stopped")
     
+    def _load_source(self, source) -> list:
+        """Load devices from a single input source"""
+        try:
+            input_module = self.plugin_manager.load_input_module(
+                source['type'],
+                source['config']
+            )
+            devices = input_module.get_devices()
+            logger.info(f"Loaded {len(devices)} devices from {source['type']}")
+            return devices
+            
+        except Exception as e:
+            logger.error(f"Failed to load devices from {source['type']}: {e}")
+            return []
+    
+    def _load_devices(self) -> list:
+        """Load devices from all input sources concurrently"""
+        if not self.config.input:
+            return []
+        
+        all_devices = []
+        with ThreadPoolExecutor(max_workers=len(self.config.input)) as executor:
+            # map() keeps the configured source order
+            for devices in executor.map(self._load_source, self.config.input):
+                all_devices.extend(devices)
+        
+        return all_devices
+    
     def sync_devices(self):
         """Sync devices from all input sources to database"""
         logger.info("Syncing devices from input sources...")
         self.last_run = datetime.now()
         
         try:
-            all_devices = []
-            
             # Load devices from all input sources
-            for source in self.config.input:
-                try:
-                    input_module = self.plugin_manager.load_input_module(
-                        source['type'],
-                        source['config']
-                    )
-                    devices = input_module.get_devices()
-                    all_devices.extend(devices)
-                    logger.info(f"Loaded {len(devices)} devices from {source['type']}")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to load devices from {source['type']}: {e}")
+            all_devices = self._load_devices()
             
             # Update database
             if all_devices:
@@ -125,25 +149,24 @@ class BackupScheduler:
             return None
     
     def run_backup(self):
+        """Execute backup of all devices, unless a backup run is already in progress"""
+        if not self._run_lock.acquire(blocking=False):
+            logger.warning("Backup run already in progress, skipping")
+            return {'success': 0, 'failed': 0, 'total': 0}
+        
+        try:
+            return self._run_backup()
+        finally:
+            self._run_lock.release()
+    
+    def _run_backup(self):
         """Execute backup of all devices from input sources"""
         logger.info("Starting backup run...")
         self.last_run = datetime.now()
         
         try:
             # Load devices from all input sources
-            all_devices = []
-            for source in self.config.input:
-                try:
-                    input_module = self.plugin_manager.load_input_module(
-                        source['type'],
-                        source['config']
-                    )
-                    devices = input_module.get_devices()
-                    all_devices.extend(devices)
-                    logger.info(f"Loaded {len(devices)} devices from {source['type']}")
-                    
-                except Exception as e:
-                    logger.error(f"Failed to load devices from {source['type']}: {e}")
+            all_devices = self._load_devices()
             
             if not all_devices:
                 logger.warning("No devices loaded from input sources")
@@ -193,6 +216,10 @@ class BackupScheduler:
             logger.error(f"Backup run failed: {e}")
             return {'success': 0, 'failed': 0, 'total': 0}
     
+    def backup_in_progress(self) -> bool:
+        """Whether a backup run is currently executing"""
+        return self._run_lock.locked()
+    
     def get_status(self):
         """Get scheduler status"""
         next_run = None
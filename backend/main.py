@@ -3,14 +3,22 @@
 EDNA - nEtwork Device coNfiguration bAckup
 Main entry point
 """
+from compileall import compile_dir
 from logging import getLogger, basicConfig
+from os import environ
 from pathlib import Path
-import uvicorn
+import sys
 
 # Load environment variables first
 from core.env_loader import load_env_file
 load_env_file()
 
+# Optionally keep bytecode outside the source tree (e.g. read-only installs);
+# set before the remaining imports so they are cached there too
+if environ.get('EDNA_PYC_CACHE'):
+    sys.pycache_prefix = environ['EDNA_PYC_CACHE']
+
+import uvicorn
 from core.config import Config
 from core.scheduler import BackupScheduler
 from core.database import DeviceDatabase
@@ -39,6 +47,9 @@ def main():
     db = DeviceDatabase()
     init_admin_user(db)
     
+    # Precompile plugins, which are imported on demand during backups
+    compile_dir(Path(__file__).parent / 'modules', quiet=1)
+    
     # Create scheduler
     scheduler = BackupScheduler(config)
     
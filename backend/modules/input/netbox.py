@@ -4,7 +4,7 @@ from typing import List
 from pynetbox import api as pynetbox_api
 
 from core.plugin_manager import InputModule
-from core.engine import Device
+from classes.device import Device
 
 logger = getLogger(__name__)
 
@@ -23,20 +23,38 @@ class Netbox(InputModule):
         self.groups = config.get('groups', {})
         self.default_username = config.get('default_username', 'admin')
         self.default_password = config.get('default_password', '')
+        self.threading = config.get('threading', True)
         
         if not self.url or not self.token:
             raise ValueError("NetBox URL and token are required")
         
-        self.nb = pynetbox_api(self.url, token=self.token)
+        # Threading fetches result pages in parallel once the device count
+        # exceeds NetBox's MAX_PAGE_SIZE (pynetbox already asks for limit=0)
+        self.nb = pynetbox_api(self.url, token=self.token, threading=self.threading)
         logger.info(f"Connected to NetBox at {self.url}")
     
+    def _custom_field_query(self) -> dict:
+        """Custom field filters that NetBox can apply server-side"""
+        # Only scalar values have an unambiguous query string form; the
+        # checks below still run on every returned device either way
+        return {
+            f'cf_{cf_name}': cf_value
+            for cf_name, cf_value in self.custom_field_filter.items()
+            if isinstance(cf_value, (str, int, float, bool))
+        }
+    
     def get_devices(self) -> List[Device]:
         """Get devices from NetBox"""
         devices = []
         
         try:
-            # Query devices from NetBox
-            nb_devices = self.nb.dcim.devices.filter(status=self.filter_status)
+            # Query devices from NetBox, letting it drop devices without a
+            # primary IP or with non-matching custom fields before they are sent
+            nb_devices = self.nb.dcim.devices.filter(
+                status=self.filter_status,
+                has_primary_ip=True,
+                **self._custom_field_query()
+            )
             
             for nb_device in nb_devices:
                 # Filter by tags if specified
@@ -5,12 +5,14 @@ from core.plugin_manager import DeviceModel
 class CiscoIos(DeviceModel):
     """Cisco IOS device model"""
     
-    def get_commands(self):
+    COMMANDS = (
+        'show version',
+        'show running-config',
+    )
+    
+    def get_commands(self) -> tuple:
         """Return commands for Cisco IOS devices"""
-        return [
-            'show version',
-            'show running-config',
-        ]
+        return self.COMMANDS
     
     def process_config(self, config: str) -> str:
         return super().process_config(config)
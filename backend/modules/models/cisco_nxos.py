@@ -5,13 +5,18 @@ from core.plugin_manager import DeviceModel
 class CiscoNxos(DeviceModel):
     """Cisco NX-OS (Nexus) model"""
     
-    def get_commands(self) -> list:
+    # running-config on large Nexus switches runs to tens of thousands of lines
+    read_until_prompt = True
+    
+    COMMANDS = (
+        'show version',
+        'show inventory',
+        'show running-config',
+    )
+    
+    def get_commands(self) -> tuple:
         """Commands to retrieve configuration"""
-        return [
-            'show version',
-            'show inventory',
-            'show running-config'
-        ]
+        return self.COMMANDS
     
     def process_config(self, config: str) -> str:
         return super().process_config(config)
@@ -4,11 +4,16 @@ from core.plugin_manager import DeviceModel
 class CiscoS300(DeviceModel):
     """Cisco Small Business switches (CBS350, SG300, etc.)"""
     
-    def get_commands(self) -> list:
+    # These switches are slow to repaint the prompt and drop output with fast_cli
+    fast_cli = False
+    
+    COMMANDS = (
+        'show running-config',
+    )
+    
+    def get_commands(self) -> tuple:
         """Return commands to get device configuration"""
-        return [
-            'show running-config'
-        ]
+        return self.COMMANDS
     
     def process_config(self, config: str) -> str:
         return super().process_config(config)
@@ -5,12 +5,14 @@ from core.plugin_manager import DeviceModel
 class Fortios(DeviceModel):
     """Fortinet FortiOS device model"""
     
-    def get_commands(self):
+    COMMANDS = (
+        'get system status',
+        'show | grep .',  # Avoids --More-- prompt
+    )
+    
+    def get_commands(self) -> tuple:
         """Return commands for FortiOS devices"""
-        return [
-            'get system status',
-            'show | grep .',  # Avoids --More-- prompt
-        ]
+        return self.COMMANDS
     
     def process_config(self, config: str) -> str:
         """Return configuration as-is without modifications"""
@@ -5,14 +5,19 @@ from core.plugin_manager import DeviceModel
 class Routeros(DeviceModel):
     """MikroTik RouterOS device model"""
     
-    def get_commands(self):
+    # /export on busy routers is several megabytes
+    read_until_prompt = True
+    
+    COMMANDS = (
+        '/system resource print',
+        '/system package update print',
+        '/system routerboard print',
+        '/export',
+    )
+    
+    def get_commands(self) -> tuple:
         """Return commands for RouterOS devices"""
-        return [
-            '/system resource print',
-            '/system package update print',
-            '/system routerboard print',
-            '/export',
-        ]
+        return self.COMMANDS
     
     def process_config(self, config: str) -> str:
         return super().process_config(config)
@@ -1,13 +1,73 @@
 """Filesystem output module with rotation"""
 from logging import getLogger
+from os import (
+    O_CREAT, O_TRUNC, O_WRONLY, DirEntry, close, makedirs, open as os_open,
+    replace, scandir, stat, unlink, write
+)
+from os.path import exists, join
 from pathlib import Path
-from datetime import datetime
-from typing import List
+from datetime import datetime, timezone
+from functools import lru_cache, partial
+from heapq import merge, nsmallest
+from operator import attrgetter
+from typing import BinaryIO, Dict, Iterator, List, Optional, Tuple
+from core.cache import TTLCache
 from core.plugin_manager import OutputModule
 from classes.backup import Backup
 
 logger = getLogger(__name__)
 
+# Timestamp embedded in backup filenames: <device>_<timestamp>.cfg
+_TIMESTAMP_FORMAT = '%Y%m%d_%H%M%S'
+
+# Read size when streaming backup content
+_CHUNK_SIZE = 64 * 1024
+
+# Units for the "elapsed time" label, largest first; anything shorter is seconds
+_ELAPSED_UNITS = ((86400, 'd'), (3600, 'h'), (60, 'm'))
+
+
+@lru_cache(maxsize=512)
+def _backup_names(device_name: str) -> Tuple[str, str]:
+    """Filename prefix of a device's backups and the name of its legacy latest link"""
+    return f"{device_name}_", f"{device_name}_latest.cfg"
+
+
+def _write_atomic(path: str, data: bytes):
+    """Write data to path through a temporary file, so readers never see a partial file"""
+    tmp_path = f"{path}.tmp"
+    try:
+        fd = os_open(tmp_path, O_WRONLY | O_CREAT | O_TRUNC, 0o666)
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[write(fd, view):]
+        finally:
+            close(fd)
+        replace(tmp_path, path)
+    except BaseException:
+        try:
+            unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _creation_time(entry: DirEntry, device_name: str) -> datetime:
+    """Creation time of a backup, from its filename timestamp when it has one"""
+    try:
+        # Saved with the same local time, so no stat() is needed
+        return datetime.strptime(entry.name[len(device_name) + 1:-4], _TIMESTAMP_FORMAT)
+    except ValueError:
+        # Not written by save_backup, fall back to the file's mtime
+        return datetime.fromtimestamp(entry.stat().st_mtime)
+
+
+def _iter_chunks(f: BinaryIO) -> Iterator[bytes]:
+    """Yield the rest of an open file in chunks, closing it when done"""
+    with f:
+        yield from iter(partial(f.read, _CHUNK_SIZE), b'')
+
 
 class Filesystem(OutputModule):
     """Filesystem output module with backup rotation"""
@@ -18,6 +78,21 @@ class Filesystem(OutputModule):
         self.retention = config.get('retention', 10)
         self.format = config.get('format', 'text')  # text or yaml
         self.organize_by = config.get('organize_by', 'device')  # device or date
+        # Hot paths join plain strings rather than building Path objects
+        self._path_str = str(self.path)
+        # device name -> (directory mtimes, [(filename, creation time)]);
+        # bounded, since device names come straight from API requests
+        self._backup_cache = TTLCache(maxsize=4096, ttl=3600)
+        
+        # Bind the layout-specific helpers once instead of branching per call
+        if self.organize_by == 'device':
+            self._device_dir = self._device_dir_by_device
+            self._parent_dirs = self._parent_dirs_by_device
+            self._locate_backup = self._locate_backup_by_device
+        else:  # by date
+            self._device_dir = self._device_dir_by_date
+            self._parent_dirs = self._parent_dirs_by_date
+            self._locate_backup = self._locate_backup_by_date
         
         # Create base directory
         self.path.mkdir(parents=True, exist_ok=True)
@@ -32,40 +107,63 @@ class Filesystem(OutputModule):
             config: Configuration string to save
         """
         try:
-            # Determine directory structure
-            if self.organize_by == 'device':
-                device_dir = self.path / device.name
-            else:  # by date
-                date_str = datetime.now().strftime('%Y-%m-%d')
-                device_dir = self.path / date_str / device.name
+            # Take the time once so the date directory and the filename
+            # timestamp always agree, even around midnight
+            now = datetime.now()
             
-            device_dir.mkdir(parents=True, exist_ok=True)
+            # Determine directory structure
+            device_dir = self._device_dir(device.name, now)
+            makedirs(device_dir, exist_ok=True)
             
             # Generate filename with timestamp
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"{device.name}_{timestamp}.cfg"
-            backup_file = device_dir / filename
+            timestamp = now.strftime(_TIMESTAMP_FORMAT)
+            filename = f"{_backup_names(device.name)[0]}{timestamp}.cfg"
+            backup_file = join(device_dir, filename)
             
             # Write configuration
-            with open(backup_file, 'w') as f:
-                f.write(config)
+            _write_atomic(backup_file, config.encode('utf-8'))
             
             logger.info(f"Saved backup to {backup_file}")
             
-            # Create/update symlink to latest
-            latest_link = device_dir / f"{device.name}_latest.cfg"
-            if latest_link.exists() or latest_link.is_symlink():
-                latest_link.unlink()
-            latest_link.symlink_to(filename)
-            
             # Perform rotation
             self._rotate_backups(device_dir, device.name)
             
+            # Directory mtimes may not tick within the filesystem's timestamp
+            # granularity, so don't rely on them for our own writes
+            self._backup_cache.pop(device.name)
+            
         except Exception as e:
             logger.error(f"Error saving backup for {device.name}: {e}")
             raise
     
-    def _rotate_backups(self, device_dir: Path, device_name: str):
+    def _device_dir_by_device(self, device_name: str, now: datetime) -> str:
+        """Directory a new backup goes to: <path>/<device>"""
+        return join(self._path_str, device_name)
+    
+    def _device_dir_by_date(self, device_name: str, now: datetime) -> str:
+        """Directory a new backup goes to: <path>/<YYYY-MM-DD>/<device>"""
+        return join(self._path_str, now.strftime('%Y-%m-%d'), device_name)
+    
+    def _parent_dirs_by_device(self) -> List[str]:
+        """Directories holding the per-device directories: the base path"""
+        return [self._path_str]
+    
+    def _parent_dirs_by_date(self) -> List[str]:
+        """Directories holding the per-device directories: one per date"""
+        # Cheap name check first, so stray files and unrelated directories
+        # (lost+found, .snapshot, ...) are never opened
+        with scandir(self._path_str) as entries:
+            return [
+                entry.path for entry in entries
+                if len(entry.name) == 10 and entry.name[4] == '-' and entry.name[7] == '-' and entry.is_dir()
+            ]
+    
+    def _device_dirs(self, device_name: str) -> List[str]:
+        """Directories that may hold backups of a device"""
+        # Only look at <parent>/<device_name> instead of walking the whole tree
+        return [join(parent, device_name) for parent in self._parent_dirs()]
+    
+    def _rotate_backups(self, device_dir: str, device_name: str):
         """
         Rotate old backups, keeping only the most recent N files
         
@@ -74,92 +172,201 @@ class Filesystem(OutputModule):
             device_name: Name of the device
         """
         try:
-            # Get all backup files (excluding symlinks)
+            latest_name = _backup_names(device_name)[1]
+            
+            # Get all backup files (excluding symlinks) with their mtime
             backup_files = [
-                f for f in device_dir.glob(f"{device_name}_*.cfg")
-                if not f.is_symlink() and f.name != f"{device_name}_latest.cfg"
+                (entry.name, entry.stat(follow_symlinks=False).st_mtime)
+                for entry in self._scan_cfgs(device_dir, device_name)
+                if entry.name != latest_name
             ]
             
-            # Sort by modification time (newest first)
-            backup_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
-            
-            # Remove old backups
+            # Remove old backups; only the oldest ones past retention need
+            # picking out, so there is no need to sort the whole list
             if len(backup_files) > self.retention:
-                files_to_remove = backup_files[self.retention:]
-                for old_file in files_to_remove:
-                    logger.info(f"Removing old backup: {old_file.name}")
-                    old_file.unlink()
+                files_to_remove = nsmallest(len(backup_files) - self.retention, backup_files, key=lambda x: x[1])
+                for name, _ in files_to_remove:
+                    logger.info(f"Removing old backup: {name}")
+                    unlink(join(device_dir, name))
                 
                 logger.info(f"Rotation complete. Kept {self.retention} backups for {device_name}")
             
         except Exception as e:
             logger.error(f"Error during backup rotation: {e}")
     
-    def get_device_backups(self, device_name: str) -> List[Backup]:
+    def _scan_cfgs(self, device_dir: str, device_name: str) -> list:
         """
-        Get list of backups for a device
+        List backup files of a device in a single directory read, skipping symlinks
+        
+        The returned DirEntry objects cache their type and stat information,
+        so callers can sort or filter on them without further syscalls.
         
         Args:
+            device_dir: Directory to scan
             device_name: Name of the device
             
         Returns:
-            List of backup info dictionaries
+            List of os.DirEntry objects, empty if the directory does not exist
         """
-        backups = []
-        
+        prefix = _backup_names(device_name)[0]
         try:
-            if self.organize_by == 'device':
-                device_dir = self.path / device_name
-            else:
-                # Search across all date directories
-                device_dir = self.path
-            
-            if not device_dir.exists():
-                return backups
-            
-            # Find all backup files
-            if self.organize_by == 'device':
-                backup_files = [
-                    f for f in device_dir.glob(f"{device_name}_*.cfg")
-                    if not f.is_symlink()
-                ]
-            else:
-                backup_files = [
-                    f for f in device_dir.rglob(f"*/{device_name}/{device_name}_*.cfg")
-                    if not f.is_symlink()
+            with scandir(device_dir) as entries:
+                return [
+                    entry for entry in entries
+                    if entry.name.startswith(prefix) and entry.name.endswith(".cfg")
+                    and not entry.is_symlink()
                 ]
+        except (FileNotFoundError, NotADirectoryError):
+            return []
+    
+    def _locate_backup_by_device(self, device_name: str, backup_id: str) -> Optional[str]:
+        """Path a backup file has in the device-organized layout"""
+        return join(self._path_str, device_name, backup_id)
+    
+    def _locate_backup_by_date(self, device_name: str, backup_id: str) -> Optional[str]:
+        """
+        Locate a backup file in the date-organized layout
+        
+        Args:
+            device_name: Name of the device
+            backup_id: Backup filename
             
-            # Sort by modification time (newest first)
-            backup_files.sort(key=lambda x: x.stat().st_mtime, reverse=True)
+        Returns:
+            Path to the backup file, or None if it does not exist
+        """
+        # The date directory follows from the YYYYMMDD part of the filename
+        ts = backup_id[len(device_name) + 1:len(device_name) + 9]
+        if ts.isdigit() and len(ts) == 8:
+            backup_file = join(self._path_str, f"{ts[0:4]}-{ts[4:6]}-{ts[6:8]}", device_name, backup_id)
+            if exists(backup_file):
+                return backup_file
+        
+        # Otherwise (ids not written by save_backup) look through the date
+        # directories newest first
+        for date_dir in sorted(self._parent_dirs(), reverse=True):
+            backup_file = join(date_dir, device_name, backup_id)
+            if exists(backup_file):
+                return backup_file
+        
+        return None
+    
+    def _list_backups(self, device_name: str) -> List[Tuple[str, datetime]]:
+        """
+        List (filename, creation time) of a device's backups, newest first
+        
+        The result is cached until one of the device's directories changes;
+        adding, replacing or removing a backup always updates the mtime of
+        the directory holding it.
+        
+        Args:
+            device_name: Name of the device
             
+        Returns:
+            List of (filename, creation time) tuples
+        """
+        device_dirs = self._device_dirs(device_name)
+        
+        mtimes = []
+        for device_dir in device_dirs:
+            try:
+                mtimes.append(stat(device_dir).st_mtime_ns)
+            except FileNotFoundError:
+                mtimes.append(None)
+        
+        # Unknown devices have nothing to list and nothing worth caching
+        if all(mtime is None for mtime in mtimes):
+            return []
+        
+        signature = (tuple(device_dirs), tuple(mtimes))
+        
+        cached = self._backup_cache.get(device_name)
+        if cached and cached[0] == signature:
+            return cached[1]
+        
+        # Find all backup files, newest first. The filename timestamp
+        # (YYYYMMDD_HHMMSS) sorts chronologically, so ordering needs no
+        # stat() and the per-directory lists only have to be merged
+        by_name = attrgetter('name')
+        backup_files = merge(
+            *(sorted(self._scan_cfgs(device_dir, device_name), key=by_name, reverse=True)
+              for device_dir in device_dirs),
+            key=by_name,
+            reverse=True
+        )
+        
+        entries = [(backup_file.name, _creation_time(backup_file, device_name)) for backup_file in backup_files]
+        
+        self._backup_cache.set(device_name, (signature, entries))
+        return entries
+    
+    def get_device_backups(self, device_name: str) -> List[Backup]:
+        """
+        Get list of backups for a device
+        
+        Args:
+            device_name: Name of the device
+            
+        Returns:
+            List of backup info dictionaries
+        """
+        try:
             now = datetime.now()
-            for backup_file in backup_files:
-                stat = backup_file.stat()
-                creation_time = datetime.fromtimestamp(stat.st_mtime)
-                elapsed = now - creation_time
-                
-                # Format elapsed time
-                if elapsed.days > 0:
-                    elapsed_str = f"{elapsed.days}d ago"
-                elif elapsed.seconds >= 3600:
-                    hours = elapsed.seconds // 3600
-                    elapsed_str = f"{hours}h ago"
-                elif elapsed.seconds >= 60:
-                    minutes = elapsed.seconds // 60
-                    elapsed_str = f"{minutes}m ago"
-                else:
-                    elapsed_str = f"{elapsed.seconds}s ago"
-                
-                backups.append(Backup(
-                    id=str(backup_file.name),
+            entries = [
+                (name, creation_time, int((now - creation_time).total_seconds()))
+                for name, creation_time in self._list_backups(device_name)
+            ]
+            
+            # Fields come straight from the listing, so skip pydantic validation;
+            # the elapsed time is formatted in the largest unit that fits
+            return [
+                Backup.model_construct(
+                    id=name,
                     creation_time=creation_time,
-                    elapsed_time=elapsed_str
-                ))
+                    elapsed_time=next(
+                        (f"{elapsed // size}{unit} ago" for size, unit in _ELAPSED_UNITS if elapsed >= size),
+                        f"{elapsed}s ago"
+                    )
+                )
+                for name, creation_time, elapsed in entries
+            ]
             
         except Exception as e:
             logger.error(f"Error getting backups for {device_name}: {e}")
+            return []
+    
+    def get_last_backups_bulk(self, device_names: List[str]) -> Dict[str, str]:
+        """
+        Get the last backup time for several devices in a single directory walk
+        
+        Args:
+            device_names: Names of the devices
+            
+        Returns:
+            Mapping of device name to UTC ISO timestamp of its last backup,
+            in the same format the database uses
+        """
+        wanted = set(device_names)
+        latest = {}
         
-        return backups
+        try:
+            for parent in self._parent_dirs():
+                # Filter on the raw entry names before touching anything else
+                with scandir(parent) as entries:
+                    device_dirs = [(entry.name, entry.path) for entry in entries if entry.name in wanted and entry.is_dir()]
+                
+                # Newest backup is the highest name, as in get_device_backups
+                for device_name, device_dir in device_dirs:
+                    for entry in self._scan_cfgs(device_dir, device_name):
+                        if device_name not in latest or entry.name > latest[device_name].name:
+                            latest[device_name] = entry
+            
+        except Exception as e:
+            logger.error(f"Error getting last backups: {e}")
+        
+        return {
+            name: _creation_time(entry, name).astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+            for name, entry in latest.items()
+        }
     
     def get_device_last_backup_content(self, device_name: str) -> str:
         """
@@ -171,7 +378,13 @@ class Filesystem(OutputModule):
             Backup content as string
         """        
         try:
-            return self.get_backup_content(device_name, Backup(id=f"{device_name}_latest.cfg"))
+            # Filenames sort chronologically, so the newest backup is simply
+            # the first listed; no "latest" symlink needs maintaining
+            backups = self._list_backups(device_name)
+            if not backups:
+                raise FileNotFoundError(f"No backups found for {device_name}")
+            
+            return self.get_backup_content(device_name, Backup(id=backups[0][0]))
         
         except Exception as e:
             logger.error(f"Error getting last backup for {device_name}: {e}")
@@ -188,20 +401,10 @@ class Filesystem(OutputModule):
             Backup content
         """
         try:
-            if self.organize_by == 'device':
-                device_dir = self.path / device_name
-            else:
-                # Search across all date directories
-                device_dir = self.path
-            
             # Locate the backup file
-            if self.organize_by == 'device':
-                backup_file = device_dir / backup.id
-            else:
-                # Search in all date subdirectories
-                backup_file = next(device_dir.rglob(f"*/{device_name}/{backup.id}"), None)
+            backup_file = self._locate_backup(device_name, backup.id)
             
-            if not backup_file or not backup_file.exists():
+            if not backup_file or not exists(backup_file):
                 raise FileNotFoundError(f"Backup file {backup.id} not found for {device_name}")
             
             with open(backup_file, 'r') as f:
@@ -211,4 +414,28 @@ class Filesystem(OutputModule):
         
         except Exception as e:
             logger.error(f"Error getting backup content for {device_name}, {backup.id}: {e}")
-            raise
\ No newline at end of file
+            raise
+    
+    def stream_backup_content(self, device_name: str, backup: Backup) -> Iterator[bytes]:
+        """
+        Stream content of a backup file in chunks without loading it whole
+        
+        Args:
+            device_name: Name of the device
+            backup: Backup to read
+            
+        Returns:
+            Iterator over the file content
+        """
+        try:
+            backup_file = self._locate_backup(device_name, backup.id)
+            
+            if not backup_file or not exists(backup_file):
+                raise FileNotFoundError(f"Backup file {backup.id} not found for {device_name}")
+            
+            # Unbuffered, so each chunk is a single read() straight from the file
+            return _iter_chunks(open(backup_file, 'rb', buffering=0))
+        
+        except Exception as e:
+            logger.error(f"Error streaming backup content for {device_name}, {backup.id}: {e}")
+            raise